@@ -21,7 +21,7 @@ pip install --upgrade pip
 
 # Install required dependencies
 echo "Installing required dependencies..."
-pip install pyvis networkx matplotlib jinja2 pyyaml configparser
+pip install pyvis networkx scipy matplotlib jinja2 pyyaml orjson configparser
 
 echo "All dependencies installed."
 
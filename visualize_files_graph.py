@@ -1,48 +1,203 @@
 import os
+import re
 import sys
 import logging
 import yaml
 import jinja2
+import jinja2.meta
 import networkx as nx
 from pyvis.network import Network
-import configparser
 import argparse
+import html
+import urllib.parse
+import multiprocessing
+import json
+import webbrowser
+from string import Template
+from collections import OrderedDict
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# orjson serializes the large node/edge lists several times faster than json; fall back to json without it
+try:
+    import orjson
+
+    def _json_dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj, **kwargs):
+        return json.dumps(obj, **kwargs)
 
 # Set up logging and print immediately to console
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.StreamHandler(sys.stdout)])
 
+# INI `[section]` headers (as with ConfigParser, anything after the last ']' is ignored) and `key = value` /
+# `key: value` options, each with the lines indented below it as continuation lines; ';' and '#' comment
+# lines are skipped
+_INI_SECTION_RE = re.compile(r'^[^\S\n]*\[([^\n]+)\][^\n]*$', re.MULTILINE)
+_INI_OPTION_RE = re.compile(r'^([^\S\n]*)([^;#=:\s\[][^=:\n]*?)[^\S\n]*[=:][^\S\n]*(.*?)[^\S\n]*$((?:\n\1[^\S\n]+[^\n]*)*)', re.MULTILINE)
+
+# One `key = value` pair per line; blank lines, '#' comments and lines without '=' are skipped
+_PROPERTY_RE = re.compile(r'^[^\S\n]*([^#=\s][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+# Shared Jinja environment; building one per template re-creates all default filters, tests and globals
+_JINJA_ENV = jinja2.Environment(cache_size=0, autoescape=False)
+
+# vis.js options for a graph whose node positions are precomputed, so physics stays off
+_VIS_OPTIONS = {
+    "nodes": {
+        "shape": "dot",
+        "scaling": {
+            "min": 10,
+            "max": 30
+        }
+    },
+    "physics": {
+        "enabled": False
+    }
+}
+
+# Options for a graph too large to lay out here: the browser places the nodes with the tuned Barnes-Hut
+# forces, settling them before the first paint
+_VIS_PHYSICS_OPTIONS = dict(_VIS_OPTIONS, physics={
+    "enabled": True,
+    "barnesHut": {
+        "gravitationalConstant": -30000,
+        "springLength": 100,
+        "springConstant": 0.04,
+        "avoidOverlap": 1
+    },
+    "minVelocity": 0.75,
+    "stabilization": {
+        "iterations": 200
+    }
+})
+
+# spring_layout grows roughly with the square of the node count; above this many nodes layout is left to vis.js
+_LAYOUT_MAX_NODES = 1000
+
+# Standalone page filled in with string.Template rather than pyvis' Jinja template. The default page
+# embeds the node and edge JSON; a --stream page starts empty and appends _STREAM_LOADER as $loader
+_HTML = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/dist/vis-network.min.css" crossorigin="anonymous" referrerpolicy="no-referrer" />
+<script src="https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js" crossorigin="anonymous" referrerpolicy="no-referrer"></script>
+<style>#graph { width: 100%; height: 1000px; border: 1px solid lightgray; }</style>
+</head>
+<body>
+<div id="graph"></div>
+<script>
+var nodes = new vis.DataSet($nodes);
+var edges = new vis.DataSet($edges);
+var network = new vis.Network(document.getElementById("graph"), {nodes: nodes, edges: edges}, $options);
+$loader
+</script>
+</body>
+</html>
+""")
+
+# Loader for --stream: nodes and edges live in NDJSON files next to the HTML and are
+# fetched and added to the vis.js DataSets in batches while the browser is idle
+_STREAM_LOADER = Template("""var whenIdle = window.requestIdleCallback || function (callback) { return setTimeout(callback, 0); };
+
+// Parse one batch of NDJSON lines and add it to the DataSet once the main thread is idle
+function addBatch(dataset, lines) {
+  return new Promise(function (resolve) {
+    whenIdle(function () {
+      dataset.add(lines.filter(function (line) { return line; }).map(JSON.parse));
+      resolve();
+    });
+  });
+}
+
+// Read an NDJSON file chunk by chunk, adding every complete line as soon as it arrives
+async function streamInto(url, dataset) {
+  var reader = (await fetch(url)).body.getReader();
+  var decoder = new TextDecoder();
+  var pending = "";
+  for (;;) {
+    var chunk = await reader.read();
+    if (chunk.done) {
+      break;
+    }
+    var lines = (pending + decoder.decode(chunk.value, {stream: true})).split("\\n");
+    pending = lines.pop();
+    await addBatch(dataset, lines);
+  }
+  await addBatch(dataset, [pending + decoder.decode()]);
+}
+
+streamInto($nodes_url, nodes).then(function () { return streamInto($edges_url, edges); });""")
+
+# Node labels and edge titles; bound str.__mod__ avoids building a fresh f-string per node or edge
+_JINJA_LABEL = "Jinja Template: %s".__mod__
+_VARIABLE_LABEL = "Variable: %s".__mod__
+_YAML_LABEL = "YAML File: %s".__mod__
+_INI_LABEL = "INI File: %s".__mod__
+_PROPERTIES_LABEL = "Properties File: %s".__mod__
+_EDGE_TITLE = "%s = %s".__mod__
+
+# LRU cache of extracted YAML relationships: absolute path -> (mtime, size, relationships)
+_YAML_CACHE = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+def _read_text(file_path):
+    """Read a small config file with one unbuffered read and decode it once."""
+    with open(file_path, 'rb', buffering=0) as f:
+        return f.read().decode('utf-8', 'replace')
+
 def extract_ini_properties(file_path):
     """Extract key-value pairs from .ini files."""
-    logging.info(f"Extracting INI properties from {file_path}")
-    config = configparser.ConfigParser()
-    config.read(file_path)
+    logging.debug("Extracting INI properties from %s", file_path)
+    data = _read_text(file_path)
+
+    # Slice the file at each [section] header and scan only the options inside that slice
+    headers = list(_INI_SECTION_RE.finditer(data))
+    sections = {}
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(data)
+        options = sections.setdefault(header.group(1), {})
+        for m in _INI_OPTION_RE.finditer(data, header.end(), end):
+            value = m.group(3)
+            if m.group(4):
+                # Like ConfigParser, fold continuation lines into the value one per line, minus comment lines
+                lines = [line.strip() for line in m.group(4).split('\n')[1:]]
+                value = '\n'.join([value] + [line for line in lines if not line.startswith((';', '#'))]).rstrip()
+            # ConfigParser lowercases option names, and a repeated option keeps its last value
+            options[m.group(2).lower()] = value
+
+    # As with ConfigParser.items(), every section also carries the options from [DEFAULT]
+    defaults = sections.pop('DEFAULT', {})
     relationships = []
-    for section in config.sections():
-        for key, value in config.items(section):
+    for section, options in sections.items():
+        for key, value in {**defaults, **options}.items():
             relationships.append((section, key, value))
     return relationships
 
 def extract_properties_file(file_path):
     """Extract key-value pairs from .property or .properties files."""
-    logging.info(f"Extracting properties from {file_path}")
-    relationships = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key, value = key.strip(), value.strip()
-                relationships.append((None, key, value))
-    return relationships
+    logging.debug("Extracting properties from %s", file_path)
+    data = _read_text(file_path)
+    return [(None, m.group(1), m.group(2)) for m in _PROPERTY_RE.finditer(data)]
 
 def extract_jinja_variables(file_path):
     """Extract variables from a Jinja template file."""
-    logging.info(f"Extracting Jinja variables from {file_path}")
+    logging.debug("Extracting Jinja variables from %s", file_path)
     try:
-        with open(file_path, 'r') as template_file:
+        with open(file_path, 'rb', buffering=0) as template_file:
             template_content = template_file.read()
+        # Without an expression or a statement there is nothing to extract, so skip the parse
+        if b'{{' not in template_content and b'{%' not in template_content:
+            return []
         # Parse the Jinja template
-        env = jinja2.Environment()
-        parsed_content = env.parse(template_content)
+        parsed_content = _JINJA_ENV.parse(template_content.decode('utf-8', 'replace'))
         # Extract undeclared variables in the template
         variables = jinja2.meta.find_undeclared_variables(parsed_content)
         return variables
@@ -50,120 +205,265 @@ def extract_jinja_variables(file_path):
         logging.error(f"Error processing Jinja template {file_path}: {e}")
         return []
 
+def _yaml_relationships(data):
+    """Flatten a parsed YAML document into (key, sub_key, sub_value) tuples."""
+    relationships = []
+
+    # Check if the data is a dictionary (key-value pairs)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    relationships.append((key, sub_key, sub_value))
+            elif isinstance(value, list):
+                # Handle list values by creating a string or processing each element
+                relationships.append((key, str(value), None))
+            else:
+                relationships.append((key, value, None))
+
+    # Check if the data is a list
+    elif isinstance(data, list):
+        for index, item in enumerate(data):
+            if isinstance(item, dict):
+                for key, value in item.items():
+                    relationships.append((f"ListItem{index}", key, value))
+            else:
+                relationships.append((f"ListItem{index}", None, item))
+
+    return relationships
+
 def extract_yaml_relationships(file_path):
-    """Extract key-value relationships from a YAML file."""
-    logging.info(f"Extracting YAML relationships from {file_path}")
-    with open(file_path, 'r') as stream:
+    """Extract key-value relationships from a YAML file, reusing the result while its mtime and size are unchanged."""
+    logging.debug("Extracting YAML relationships from %s", file_path)
+    st = os.stat(file_path)
+    cache_key = os.path.abspath(file_path)
+    cached = _YAML_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (st.st_mtime, st.st_size):
+        _YAML_CACHE.move_to_end(cache_key)
+        return cached[2]
+
+    try:
+        with open(file_path, 'r') as stream:
+            data = yaml.load(stream, Loader=_Loader)
+    except yaml.YAMLError as exc:
+        logging.error(f"Error processing file {file_path}: {exc}")
+        return []
+
+    # Only the flattened tuples are kept; the document tree is released as soon as this returns
+    relationships = _yaml_relationships(data)
+    _YAML_CACHE[cache_key] = (st.st_mtime, st.st_size, relationships)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+    return relationships
+
+def _iter_files(directory):
+    """Yield (file name, file path) for every regular file below directory, reusing scandir entry types.
+
+    Like os.walk, symlinked directories are not descended into but symlinked files are yielded.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
         try:
-            data = yaml.safe_load(stream)
-            relationships = []
-
-            # Check if the data is a dictionary (key-value pairs)
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if isinstance(value, dict):
-                        for sub_key, sub_value in value.items():
-                            relationships.append((key, sub_key, sub_value))
-                    elif isinstance(value, list):
-                        # Handle list values by creating a string or processing each element
-                        relationships.append((key, str(value), None))
-                    else:
-                        relationships.append((key, value, None))
-
-            # Check if the data is a list
-            elif isinstance(data, list):
-                for index, item in enumerate(data):
-                    if isinstance(item, dict):
-                        for key, value in item.items():
-                            relationships.append((f"ListItem{index}", key, value))
-                    else:
-                        relationships.append((f"ListItem{index}", None, item))
-
-            return relationships
-        
-        except yaml.YAMLError as exc:
-            logging.error(f"Error processing file {file_path}: {exc}")
-            return []
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.name, entry.path
+        except OSError as exc:
+            # os.walk silently skipped unreadable directories; keep going but say so
+            logging.error(f"Error scanning directory {current}: {exc}")
+
+def _intern(name):
+    """Intern string node names so a key repeated across many files is stored once; other types pass through."""
+    return sys.intern(name) if type(name) is str else name
+
+def _handle_jinja(nodes, edges, seen, file_name, variables):
+    """Queue a Jinja template and the variables it uses onto the node and edge buffers."""
+    logging.debug("Processing Jinja file: %s", file_name)
+    if variables:
+        if file_name not in seen:
+            nodes.append((file_name, {"label": _JINJA_LABEL(file_name), "type": "jinja"}))
+            seen.add(file_name)
+        for var in variables:
+            var = _intern(var)
+            if var not in seen:
+                nodes.append((var, {"label": _VARIABLE_LABEL(var), "type": "variable"}))
+                seen.add(var)
+            edges.append((file_name, var, {"key": "uses", "value": f"{var} used in {file_name}"}))
+
+def _handle_yaml(nodes, edges, seen, file_name, relationships):
+    """Queue a YAML file and its keys onto the node and edge buffers."""
+    logging.debug("Processing YAML file: %s", file_name)
+    for key, sub_key, sub_value in relationships:
+        if file_name not in seen:
+            nodes.append((file_name, {"label": _YAML_LABEL(file_name), "type": "yaml"}))
+            seen.add(file_name)
+        if sub_key is not None:
+            if isinstance(sub_key, list):
+                sub_key = str(sub_key)  # Convert the list to a string representation
+            sub_key = _intern(sub_key)
+            if sub_key not in seen:
+                nodes.append((sub_key, {"label": str(sub_key), "type": "yaml_key"}))
+                seen.add(sub_key)
+            edges.append((file_name, sub_key, {"key": key, "value": sub_value}))
+
+def _handle_ini(nodes, edges, seen, file_name, relationships):
+    """Queue an .ini file's sections and keys onto the node and edge buffers."""
+    logging.debug("Processing INI file: %s", file_name)
+    for section, key, value in relationships:
+        section_name = _intern(section) if section else file_name
+        key = _intern(key)
+        if section_name not in seen:
+            nodes.append((section_name, {"label": _INI_LABEL(section_name), "type": "ini"}))
+            seen.add(section_name)
+        if key not in seen:
+            nodes.append((key, {"label": str(key), "type": "ini_key"}))
+            seen.add(key)
+        edges.append((section_name, key, {"key": key, "value": value}))
+
+def _handle_properties(nodes, edges, seen, file_name, relationships):
+    """Queue a .property/.properties file and its keys onto the node and edge buffers."""
+    logging.debug("Processing Properties file: %s", file_name)
+    for section, key, value in relationships:
+        key = _intern(key)
+        if file_name not in seen:
+            nodes.append((file_name, {"label": _PROPERTIES_LABEL(file_name), "type": "properties"}))
+            seen.add(file_name)
+        if key not in seen:
+            nodes.append((key, {"label": str(key), "type": "property_key"}))
+            seen.add(key)
+        edges.append((file_name, key, {"key": key, "value": value}))
+
+# Map file extensions to (extractor, handler); any file with 'jinja' in its name is a template
+_JINJA_HANDLER = (extract_jinja_variables, _handle_jinja)
+_HANDLERS = {
+    '.j2': _JINJA_HANDLER,
+    '.yml': (extract_yaml_relationships, _handle_yaml),
+    '.yaml': (extract_yaml_relationships, _handle_yaml),
+    '.ini': (extract_ini_properties, _handle_ini),
+    '.property': (extract_properties_file, _handle_properties),
+    '.properties': (extract_properties_file, _handle_properties),
+}
 
-def generate_interactive_relationship_graph(directory, output_html):
-    """Generates an interactive relationship graph using Pyvis and saves it as an HTML file."""
+def _extract_one(task):
+    """Run one (extractor, file path) task; module level so worker processes can unpickle it."""
+    extractor, file_path = task
+    return extractor(file_path)
+
+# Runs with no more tasks than this are parsed in-process; a pool would cost more to start than it saves
+_POOL_MIN_TASKS = 64
+
+def _extract_all(tasks, jobs):
+    """Yield extraction results in task order, parsing in a process pool unless jobs == 1 or there are few tasks."""
+    if jobs == 1 or len(tasks) <= _POOL_MIN_TASKS:
+        yield from map(_extract_one, tasks)
+        return
+    # About four chunks per worker balances the load without a round trip per file, and no
+    # more workers are started than there are chunks to hand out
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    workers = min(workers, -(-len(tasks) // chunksize))
+    # imap rather than imap_unordered: results arrive in walk order, so the graph is built deterministically
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(_extract_one, tasks, chunksize=chunksize)
+
+def _script_json(obj):
+    """Serialize obj for embedding in a <script> block, so a '</script>' inside a value cannot end it."""
+    return _json_dumps(obj).replace("</", "<\\/")
+
+def write_html(output_html, vis_nodes, vis_edges, options=_VIS_OPTIONS):
+    """Write a self-contained page with the vis.js node and edge records embedded."""
+    with open(output_html, 'w', encoding='utf-8') as out:
+        out.write(_HTML.substitute(
+            title=html.escape(os.path.basename(output_html)),
+            nodes=_script_json(vis_nodes),
+            edges=_script_json(vis_edges),
+            options=_script_json(options),
+            loader="",
+        ))
+
+def write_streaming_html(output_html, vis_nodes, vis_edges, options=_VIS_OPTIONS):
+    """Write the node and edge records to NDJSON files beside output_html and a page that streams them in."""
+    base = os.path.splitext(output_html)[0]
+    nodes_path = f"{base}.nodes.ndjson"
+    edges_path = f"{base}.edges.ndjson"
+
+    for path, records in ((nodes_path, vis_nodes), (edges_path, vis_edges)):
+        with open(path, 'w', encoding='utf-8') as out:
+            for record in records:
+                out.write(_json_dumps(record))
+                out.write("\n")
+
+    with open(output_html, 'w', encoding='utf-8') as out:
+        out.write(_HTML.substitute(
+            title=html.escape(os.path.basename(output_html)),
+            nodes="[]",
+            edges="[]",
+            options=_script_json(options),
+            loader=_STREAM_LOADER.substitute(
+                nodes_url=_script_json(urllib.parse.quote(os.path.basename(nodes_path))),
+                edges_url=_script_json(urllib.parse.quote(os.path.basename(edges_path))),
+            ),
+        ))
+
+def write_pyvis_html(output_html, vis_nodes, vis_edges, open_browser=False, options=_VIS_OPTIONS):
+    """Render the node and edge records through pyvis' own template."""
+    net = Network(height="1000px", width="100%", directed=True)
+    # The pyvis template embeds nodes and edges through Jinja's tojson filter; route it through _json_dumps
+    net.templateEnv.policies["json.dumps_function"] = _json_dumps
+    for record in vis_nodes:
+        net.add_node(record["id"], **{key: value for key, value in record.items() if key != "id"})
+    for record in vis_edges:
+        net.add_edge(record["from"], record["to"], title=record["title"])
+    net.set_options(json.dumps(options))
+    net.write_html(output_html, notebook=False, open_browser=open_browser)
+
+def generate_interactive_relationship_graph(directory, output_html, jobs=None, open_browser=False, stream=False, use_pyvis=False,
+                                            layout_max_nodes=_LAYOUT_MAX_NODES):
+    """Generates an interactive vis.js relationship graph and saves it as an HTML file.
+
+    Files are parsed in a pool of `jobs` worker processes (default: one per CPU); jobs=1, or a run with
+    only a handful of files, parses in-process.
+    The HTML is only written unless `open_browser` is set, in which case it is also opened in a browser.
+    With `stream` the nodes and edges go to NDJSON sidecar files that the page loads incrementally;
+    browsers refuse to fetch() those from file:// URLs, so serve the output directory over HTTP.
+    With `use_pyvis` the page is rendered through pyvis' template instead of the built-in one.
+    Graphs of up to `layout_max_nodes` nodes are laid out here; larger ones are laid out by vis.js physics.
+    """
     logging.info(f"Starting to generate relationship graph from directory: {directory}")
     
-    G = nx.DiGraph()
-
-    node_count = 0
-    edge_count = 0
+    # Nodes and edges are buffered as (name, attrs) / (source, target, attrs) and rendered after the walk.
+    # seen holds the node names already buffered so each node is queued once.
+    nodes = []
+    edges = []
+    seen = set()
+    # Parsing tasks as (extractor, file path), with the matching (handler, file name) at the same index
+    tasks = []
+    targets = []
 
     logging.info(f"Scanning directory {directory} for files")
     
-    for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_name = os.path.basename(file_path)
-            
-            # Log every found file
-            logging.info(f"Found file: {file_name}")
-
-            # Process Jinja templates
-            if file.endswith('.j2') or 'jinja' in file:
-                logging.info(f"Processing Jinja file: {file_name}")
-                variables = extract_jinja_variables(file_path)
-                if variables:
-                    G.add_node(file_name, label=f"Jinja Template: {file_name}", type="jinja")
-                    node_count += 1
-                    for var in variables:
-                        G.add_node(var, label=f"Variable: {var}", type="variable")
-                        G.add_edge(file_name, var, key="uses", value=f"{var} used in {file_name}")
-                        node_count += 1
-                        edge_count += 1
-            
-            # Process YAML files
-            elif file.endswith('.yml') or file.endswith('.yaml'):
-                logging.info(f"Processing YAML file: {file_name}")
-                relationships = extract_yaml_relationships(file_path)
-                for key, sub_key, sub_value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"YAML File: {file_name}", type="yaml")
-                        node_count += 1
-                    if sub_key is not None:
-                        if isinstance(sub_key, list):
-                            sub_key = str(sub_key)  # Convert the list to a string representation
-                        if not G.has_node(sub_key):
-                            G.add_node(sub_key, label=str(sub_key), type="yaml_key")
-                        G.add_edge(file_name, sub_key, key=key, value=sub_value)
-                        edge_count += 1
-
-            # Process .ini files
-            elif file.endswith('.ini'):
-                logging.info(f"Processing INI file: {file_name}")
-                relationships = extract_ini_properties(file_path)
-                for section, key, value in relationships:
-                    section_name = section if section else file_name
-                    if not G.has_node(section_name):
-                        G.add_node(section_name, label=f"INI File: {section_name}", type="ini")
-                        node_count += 1
-                    G.add_node(key, label=str(key), type="ini_key")
-                    node_count += 1
-                    G.add_edge(section_name, key, key=key, value=value)
-                    edge_count += 1
-
-            # Process .property or .properties files
-            elif file.endswith('.property') or file.endswith('.properties'):
-                logging.info(f"Processing Properties file: {file_name}")
-                relationships = extract_properties_file(file_path)
-                for section, key, value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"Properties File: {file_name}", type="properties")
-                        node_count += 1
-                    G.add_node(key, label=str(key), type="property_key")
-                    node_count += 1
-                    G.add_edge(file_name, key, key=key, value=value)
-                    edge_count += 1
-
-    # Create an interactive graph using Pyvis
-    net = Network(height="1000px", width="100%", directed=True)
+    for file_name, file_path in _iter_files(directory):
+        # Log every found file
+        logging.debug("Found file: %s", file_name)
+
+        # Pick the handler from the extension; 'jinja' in the name wins, as it always has
+        if 'jinja' in file_name:
+            extractor, handler = _JINJA_HANDLER
+        else:
+            extractor, handler = _HANDLERS.get(file_name[file_name.rfind('.'):].lower(), (None, None))
+        if handler is not None:
+            tasks.append((extractor, file_path))
+            targets.append((handler, file_name))
+
+    for extracted, (handler, file_name) in zip(_extract_all(tasks, jobs), targets):
+        handler(nodes, edges, seen, file_name, extracted)
+
+    node_count = len(nodes)
+    edge_count = len(edges)
 
-    # Add nodes and edges from NetworkX graph to Pyvis graph
     color_map = {
         "yaml": "lightblue",
         "yaml_key": "lightgreen",
@@ -175,52 +475,88 @@ def generate_interactive_relationship_graph(directory, output_html):
         "property_key": "lightpink"
     }
 
-    for node, data in G.nodes(data=True):
+    # Collapse repeated source/target pairs the way a DiGraph would: first position, last attributes
+    unique_edges = {}
+    for source, target, data in edges:
+        unique_edges[(source, target)] = data
+
+    # Lay small graphs out once here so the browser only has to paint them instead of running a physics
+    # simulation; past layout_max_nodes the Python layout costs far more than letting vis.js do it
+    if node_count <= layout_max_nodes:
+        layout_graph = nx.DiGraph()
+        layout_graph.add_nodes_from(node for node, _ in nodes)
+        layout_graph.add_edges_from(unique_edges)
+        pos = nx.spring_layout(layout_graph, seed=0, iterations=50, scale=1000)
+        options = _VIS_OPTIONS
+    else:
+        logging.info(f"{node_count} nodes exceed the layout limit of {layout_max_nodes}; leaving layout to the browser")
+        pos = None
+        options = _VIS_PHYSICS_OPTIONS
+
+    # Build the vis.js records directly; the first node wins when two names share the same string id
+    vis_nodes = []
+    node_ids = set()
+    for node, data in nodes:
+        node_id = str(node)
+        if node_id in node_ids:
+            continue
+        node_ids.add(node_id)
         node_type = data.get("type", "default")
         color = color_map.get(node_type, "lightblue")
         size = 15 if node_type in ["yaml", "jinja", "ini", "properties"] else 10  # Make file nodes larger
-        net.add_node(str(node), title=str(data.get('label', node)), label=str(data.get('label', node)), color=color, size=size)
+        label = str(data.get('label', node))
+        record = {"id": node_id, "label": label, "title": label, "shape": "dot", "color": color, "size": size}
+        if pos is not None:
+            x, y = pos[node]
+            record.update(x=float(x), y=float(y), physics=False)
+        vis_nodes.append(record)
 
-    for source, target, data in G.edges(data=True):
-        net.add_edge(str(source), str(target), title=f"{data.get('key', '')} = {data.get('value', '')}")
-
-    # Customize physics for less bouncing and better organization
-    net.set_options("""
-    var options = {
-      "nodes": {
-        "shape": "dot",
-        "scaling": {
-          "min": 10,
-          "max": 30
-        }
-      },
-      "physics": {
-        "barnesHut": {
-          "gravitationalConstant": -30000,
-          "springLength": 100,
-          "springConstant": 0.04,
-          "avoidOverlap": 1
-        },
-        "minVelocity": 0.75
-      }
-    }
-    """)
+    vis_edges = []
+    for (source, target), data in unique_edges.items():
+        vis_edges.append({"from": str(source), "to": str(target), "arrows": "to",
+                          "title": _EDGE_TITLE((data.get('key', ''), data.get('value', '')))})
 
     logging.info(f"Generating interactive graph and saving it to {output_html}")
-    
-    net.show(output_html, notebook=False)
+
+    if use_pyvis:
+        write_pyvis_html(output_html, vis_nodes, vis_edges, open_browser=open_browser, options=options)
+    else:
+        if stream:
+            write_streaming_html(output_html, vis_nodes, vis_edges, options=options)
+        else:
+            write_html(output_html, vis_nodes, vis_edges, options=options)
+        if open_browser:
+            webbrowser.open(os.path.abspath(output_html))
 
     logging.info(f"Graph generation completed")
     logging.info(f"Nodes added: {node_count}")
     logging.info(f"Edges added: {edge_count}")
     logging.info(f"Output HTML file: {output_html}")
 
+def _positive_int(value):
+    """argparse type for --jobs: an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 if __name__ == "__main__":
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Generate interactive relationship diagrams from YAML, Jinja, .ini, and .property/.properties files.")
     parser.add_argument("playbook_path", type=str, help="Path to the directory containing YAML, Jinja, .ini, and properties files.")
     parser.add_argument("output_html", type=str, help="Output path for the HTML file.")
+    parser.add_argument("--jobs", type=_positive_int, default=None, help="Number of worker processes used to parse files (default: one per CPU, 1 disables the pool).")
+    parser.add_argument("--open", action="store_true", help="Open the generated HTML file in a web browser.")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument("--stream", action="store_true", help="Write nodes and edges to NDJSON files next to the HTML and load them incrementally in the page (serve the directory over HTTP).")
+    output_format.add_argument("--pyvis", action="store_true", help="Render the page with pyvis' template instead of the built-in one.")
+    parser.add_argument("--layout-max-nodes", type=int, default=_LAYOUT_MAX_NODES, help=f"Largest graph laid out before writing the page; larger graphs are laid out in the browser (default: {_LAYOUT_MAX_NODES}, 0 always leaves layout to the browser).")
+    parser.add_argument("--verbose", action="store_true", help="Log every file found, parsed and added to the graph.")
     args = parser.parse_args()
 
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
     # Generate the interactive relationship graph
-    generate_interactive_relationship_graph(args.playbook_path, args.output_html)
+    generate_interactive_relationship_graph(args.playbook_path, args.output_html, jobs=args.jobs, open_browser=args.open, stream=args.stream, use_pyvis=args.pyvis,
+                                            layout_max_nodes=args.layout_max_nodes)
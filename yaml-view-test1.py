@@ -7,6 +7,13 @@ import matplotlib.pyplot as plt
 from networkx.drawing.nx_agraph import to_agraph
 import configparser
 import argparse
+from collections import defaultdict
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 def extract_ini_properties(file_path):
     """Extract key-value pairs from .ini files."""
@@ -21,12 +28,14 @@ def extract_ini_properties(file_path):
 def extract_properties_file(file_path):
     """Extract key-value pairs from .property or .properties files."""
     relationships = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key, value = key.strip(), value.strip()
-                relationships.append((None, key, value))
+    # One unbuffered read and a single decode; iterating a text file decodes line by line
+    with open(file_path, 'rb', buffering=0) as f:
+        data = f.read().decode('utf-8', 'replace')
+    for line in data.splitlines():
+        if '=' in line:
+            key, value = line.split('=', 1)
+            key, value = key.strip(), value.strip()
+            relationships.append((None, key, value))
     return relationships
 
 def extract_jinja_variables(file_path):
@@ -48,7 +57,7 @@ def extract_yaml_relationships(file_path):
     """Extract key-value relationships from a YAML file."""
     with open(file_path, 'r') as stream:
         try:
-            data = yaml.safe_load(stream)
+            data = yaml.load(stream, Loader=_Loader)
             relationships = []
             for key, value in data.items():
                 if isinstance(value, dict):
@@ -59,70 +68,85 @@ def extract_yaml_relationships(file_path):
             print(f"Error processing file {file_path}: {exc}")
             return []
 
+def _add_edge(G, edge_lines, source, target, key, value):
+    """Add an edge labelled for graphviz and record its text for the source node's label."""
+    G.add_edge(source, target, key=key, value=value, label=f"{key} = {value}")
+    edge_lines[source][target] = f"{target}: {key} = {value}"
+
+def _handle_jinja(G, edge_lines, file_path, file_name):
+    """Add a Jinja template and the variables it uses to G."""
+    variables = extract_jinja_variables(file_path)
+    if variables:
+        G.add_node(file_name, label=f"Jinja Template: {file_name}")
+        for var in variables:
+            G.add_node(var, label=f"Variable: {var}")
+            _add_edge(G, edge_lines, file_name, var, "uses", f"{var} used in {file_name}")
+
+def _handle_yaml(G, edge_lines, file_path, file_name):
+    """Add a YAML file and its keys to G."""
+    relationships = extract_yaml_relationships(file_path)
+    for key, sub_key, sub_value in relationships:
+        if not G.has_node(file_name):
+            G.add_node(file_name, label=f"YAML File: {file_name}")
+        if not G.has_node(sub_key):
+            G.add_node(sub_key, label=sub_key)
+        _add_edge(G, edge_lines, file_name, sub_key, key, sub_value)
+
+def _handle_ini(G, edge_lines, file_path, file_name):
+    """Add an .ini file's sections and keys to G."""
+    relationships = extract_ini_properties(file_path)
+    for section, key, value in relationships:
+        section_name = section if section else file_name
+        if not G.has_node(section_name):
+            G.add_node(section_name, label=f"INI File: {section_name}")
+        G.add_node(key, label=key)
+        _add_edge(G, edge_lines, section_name, key, key, value)
+
+def _handle_properties(G, edge_lines, file_path, file_name):
+    """Add a .property/.properties file and its keys to G."""
+    relationships = extract_properties_file(file_path)
+    for section, key, value in relationships:
+        if not G.has_node(file_name):
+            G.add_node(file_name, label=f"Properties File: {file_name}")
+        G.add_node(key, label=key)
+        _add_edge(G, edge_lines, file_name, key, key, value)
+
+# Map file extensions to their handlers; any file with 'jinja' in its name is a template
+_HANDLERS = {
+    '.j2': _handle_jinja,
+    '.yml': _handle_yaml,
+    '.yaml': _handle_yaml,
+    '.ini': _handle_ini,
+    '.property': _handle_properties,
+    '.properties': _handle_properties,
+}
+
 def generate_relationship_graph(directory, output_svg, output_png):
     """Generates a relationship graph from all YAML, Jinja, .ini, .property, and .properties files and saves it as SVG and PNG."""
     G = nx.DiGraph()
+    # Per source node, the "target: key = value" text of its outgoing edges, in graph order
+    edge_lines = defaultdict(dict)
 
     # Traverse the directory recursively to find YAML, Jinja, .ini, and .property/.properties files
     for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_name = os.path.basename(file_path)
-            
-            # Process Jinja templates
-            if file.endswith('.j2') or 'jinja' in file:
-                variables = extract_jinja_variables(file_path)
-                if variables:
-                    G.add_node(file_name, label=f"Jinja Template: {file_name}")
-                    for var in variables:
-                        G.add_node(var, label=f"Variable: {var}")
-                        G.add_edge(file_name, var, key="uses", value=f"{var} used in {file_name}")
-            
-            # Process YAML files
-            elif file.endswith('.yml') or file.endswith('.yaml'):
-                relationships = extract_yaml_relationships(file_path)
-                for key, sub_key, sub_value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"YAML File: {file_name}")
-                    if not G.has_node(sub_key):
-                        G.add_node(sub_key, label=sub_key)
-                    G.add_edge(file_name, sub_key, key=key, value=sub_value)
-
-            # Process .ini files
-            elif file.endswith('.ini'):
-                relationships = extract_ini_properties(file_path)
-                for section, key, value in relationships:
-                    section_name = section if section else file_name
-                    if not G.has_node(section_name):
-                        G.add_node(section_name, label=f"INI File: {section_name}")
-                    G.add_node(key, label=key)
-                    G.add_edge(section_name, key, key=key, value=value)
-
-            # Process .property or .properties files
-            elif file.endswith('.property') or file.endswith('.properties'):
-                relationships = extract_properties_file(file_path)
-                for section, key, value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"Properties File: {file_name}")
-                    G.add_node(key, label=key)
-                    G.add_edge(file_name, key, key=key, value=value)
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
+
+            # Pick the handler from the extension; 'jinja' in the name wins, as it always has
+            if 'jinja' in file_name:
+                handler = _handle_jinja
+            else:
+                handler = _HANDLERS.get(file_name[file_name.rfind('.'):].lower())
+            if handler is not None:
+                handler(G, edge_lines, file_path, file_name)
+
+    # Fold each node's outgoing edges into its label; edges were labelled when added, so to_agraph carries both over
+    for node, data in G.nodes(data=True):
+        data["label"] = f"{data['label']}\n" + "\n".join(edge_lines.get(node, {}).values())
 
     # Create a graph using pygraphviz to render it as SVG and PNG
     A = to_agraph(G)
 
-    # Enhance nodes and edges with properties
-    for node in G.nodes(data=True):
-        node_label = f"{node[1]['label']}\n"
-        node_data = []
-        for n in G[node[0]]:
-            node_data.append(f"{n}: {G[node[0]][n]['key']} = {G[node[0]][n]['value']}")
-        node_label += "\n".join(node_data)
-        A.get_node(node[0]).attr["label"] = node_label
-
-    for edge in G.edges(data=True):
-        edge_label = f"{edge[2]['key']} = {edge[2]['value']}"
-        A.get_edge(edge[0], edge[1]).attr["label"] = edge_label
-
     A.layout(prog='dot')  # Using 'dot' layout for a hierarchical graph structure
     A.draw(output_svg)
     A.draw(output_png)
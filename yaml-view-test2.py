@@ -4,17 +4,23 @@ import logging
 import yaml
 import jinja2
 import networkx as nx
-import matplotlib.pyplot as plt
 from networkx.drawing.nx_agraph import to_agraph
 import configparser
 import argparse
+from collections import defaultdict
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # Set up logging and print immediately to console
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.StreamHandler(sys.stdout)])
 
 def extract_ini_properties(file_path):
     """Extract key-value pairs from .ini files."""
-    logging.info(f"Extracting INI properties from {file_path}")
+    logging.debug("Extracting INI properties from %s", file_path)
     config = configparser.ConfigParser()
     config.read(file_path)
     relationships = []
@@ -25,19 +31,21 @@ def extract_ini_properties(file_path):
 
 def extract_properties_file(file_path):
     """Extract key-value pairs from .property or .properties files."""
-    logging.info(f"Extracting properties from {file_path}")
+    logging.debug("Extracting properties from %s", file_path)
     relationships = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key, value = key.strip(), value.strip()
-                relationships.append((None, key, value))
+    # One unbuffered read and a single decode; iterating a text file decodes line by line
+    with open(file_path, 'rb', buffering=0) as f:
+        data = f.read().decode('utf-8', 'replace')
+    for line in data.splitlines():
+        if '=' in line:
+            key, value = line.split('=', 1)
+            key, value = key.strip(), value.strip()
+            relationships.append((None, key, value))
     return relationships
 
 def extract_jinja_variables(file_path):
     """Extract variables from a Jinja template file."""
-    logging.info(f"Extracting Jinja variables from {file_path}")
+    logging.debug("Extracting Jinja variables from %s", file_path)
     try:
         with open(file_path, 'r') as template_file:
             template_content = template_file.read()
@@ -53,10 +61,10 @@ def extract_jinja_variables(file_path):
 
 def extract_yaml_relationships(file_path):
     """Extract key-value relationships from a YAML file."""
-    logging.info(f"Extracting YAML relationships from {file_path}")
+    logging.debug("Extracting YAML relationships from %s", file_path)
     with open(file_path, 'r') as stream:
         try:
-            data = yaml.safe_load(stream)
+            data = yaml.load(stream, Loader=_Loader)
             relationships = []
 
             # Check if the data is a dictionary (key-value pairs)
@@ -86,11 +94,96 @@ def extract_yaml_relationships(file_path):
             logging.error(f"Error processing file {file_path}: {exc}")
             return []
         
-def generate_relationship_graph(directory, output_svg, output_png):
+def _add_edge(G, edge_lines, source, target, key, value):
+    """Add an edge labelled for graphviz and record its text for the source node's label."""
+    G.add_edge(source, target, key=key, value=value, label=f"{key} = {value}")
+    edge_lines[source][target] = f"{target}: {key} = {value}"
+
+def _handle_jinja(G, edge_lines, file_path, file_name):
+    """Add a Jinja template and the variables it uses to G. Returns (nodes added, edges added)."""
+    logging.debug("Processing Jinja file: %s", file_name)
+    node_count = 0
+    edge_count = 0
+    variables = extract_jinja_variables(file_path)
+    if variables:
+        G.add_node(file_name, label=f"Jinja Template: {file_name}")
+        node_count += 1
+        for var in variables:
+            G.add_node(var, label=f"Variable: {var}")
+            _add_edge(G, edge_lines, file_name, var, "uses", f"{var} used in {file_name}")
+            node_count += 1
+            edge_count += 1
+    return node_count, edge_count
+
+def _handle_yaml(G, edge_lines, file_path, file_name):
+    """Add a YAML file and its keys to G. Returns (nodes added, edges added)."""
+    logging.debug("Processing YAML file: %s", file_name)
+    node_count = 0
+    edge_count = 0
+    relationships = extract_yaml_relationships(file_path)
+    for key, sub_key, sub_value in relationships:
+        if not G.has_node(file_name):
+            G.add_node(file_name, label=f"YAML File: {file_name}")
+            node_count += 1
+        if sub_key is not None:
+            if isinstance(sub_key, list):
+                sub_key = str(sub_key)  # Convert the list to a string representation
+            if not G.has_node(sub_key):
+                G.add_node(sub_key, label=sub_key)
+            _add_edge(G, edge_lines, file_name, sub_key, key, sub_value)
+            edge_count += 1
+    return node_count, edge_count
+
+def _handle_ini(G, edge_lines, file_path, file_name):
+    """Add an .ini file's sections and keys to G. Returns (nodes added, edges added)."""
+    logging.debug("Processing INI file: %s", file_name)
+    node_count = 0
+    edge_count = 0
+    relationships = extract_ini_properties(file_path)
+    for section, key, value in relationships:
+        section_name = section if section else file_name
+        if not G.has_node(section_name):
+            G.add_node(section_name, label=f"INI File: {section_name}")
+            node_count += 1
+        G.add_node(key, label=key)
+        node_count += 1
+        _add_edge(G, edge_lines, section_name, key, key, value)
+        edge_count += 1
+    return node_count, edge_count
+
+def _handle_properties(G, edge_lines, file_path, file_name):
+    """Add a .property/.properties file and its keys to G. Returns (nodes added, edges added)."""
+    logging.debug("Processing Properties file: %s", file_name)
+    node_count = 0
+    edge_count = 0
+    relationships = extract_properties_file(file_path)
+    for section, key, value in relationships:
+        if not G.has_node(file_name):
+            G.add_node(file_name, label=f"Properties File: {file_name}")
+            node_count += 1
+        G.add_node(key, label=key)
+        node_count += 1
+        _add_edge(G, edge_lines, file_name, key, key, value)
+        edge_count += 1
+    return node_count, edge_count
+
+# Map file extensions to their handlers; any file with 'jinja' in its name is a template
+_HANDLERS = {
+    '.j2': _handle_jinja,
+    '.yml': _handle_yaml,
+    '.yaml': _handle_yaml,
+    '.ini': _handle_ini,
+    '.property': _handle_properties,
+    '.properties': _handle_properties,
+}
+
+def generate_relationship_graph(directory, output_svg, output_png, hires=False, matplotlib_debug=False):
     """Generates a relationship graph from all YAML, Jinja, .ini, .property, and .properties files and saves it as SVG and PNG."""
     logging.info(f"Starting to generate relationship graph from directory: {directory}")
     
     G = nx.DiGraph()
+    # Per source node, the "target: key = value" text of its outgoing edges, in graph order
+    edge_lines = defaultdict(dict)
 
     # Ensure output directories exist
     svg_dir = os.path.dirname(output_svg)
@@ -110,84 +203,27 @@ def generate_relationship_graph(directory, output_svg, output_png):
     logging.info(f"Scanning directory {directory} for files")
     
     for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_name = os.path.basename(file_path)
-            
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
             # Log every found file
-            logging.info(f"Found file: {file_name}")
-
-            # Process Jinja templates
-            if file.endswith('.j2') or 'jinja' in file:
-                logging.info(f"Processing Jinja file: {file_name}")
-                variables = extract_jinja_variables(file_path)
-                if variables:
-                    G.add_node(file_name, label=f"Jinja Template: {file_name}")
-                    node_count += 1
-                    for var in variables:
-                        G.add_node(var, label=f"Variable: {var}")
-                        G.add_edge(file_name, var, key="uses", value=f"{var} used in {file_name}")
-                        node_count += 1
-                        edge_count += 1
-            
-            # Process YAML files
-            elif file.endswith('.yml') or file.endswith('.yaml'):
-                logging.info(f"Processing YAML file: {file_name}")
-                relationships = extract_yaml_relationships(file_path)
-                for key, sub_key, sub_value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"YAML File: {file_name}")
-                        node_count += 1
-                    if sub_key is not None:
-                        if isinstance(sub_key, list):
-                            sub_key = str(sub_key)  # Convert the list to a string representation
-                        if not G.has_node(sub_key):
-                            G.add_node(sub_key, label=sub_key)
-                        G.add_edge(file_name, sub_key, key=key, value=sub_value)
-                        edge_count += 1
-
-            # Process .ini files
-            elif file.endswith('.ini'):
-                logging.info(f"Processing INI file: {file_name}")
-                relationships = extract_ini_properties(file_path)
-                for section, key, value in relationships:
-                    section_name = section if section else file_name
-                    if not G.has_node(section_name):
-                        G.add_node(section_name, label=f"INI File: {section_name}")
-                        node_count += 1
-                    G.add_node(key, label=key)
-                    node_count += 1
-                    G.add_edge(section_name, key, key=key, value=value)
-                    edge_count += 1
-
-            # Process .property or .properties files
-            elif file.endswith('.property') or file.endswith('.properties'):
-                logging.info(f"Processing Properties file: {file_name}")
-                relationships = extract_properties_file(file_path)
-                for section, key, value in relationships:
-                    if not G.has_node(file_name):
-                        G.add_node(file_name, label=f"Properties File: {file_name}")
-                        node_count += 1
-                    G.add_node(key, label=key)
-                    node_count += 1
-                    G.add_edge(file_name, key, key=key, value=value)
-                    edge_count += 1
+            logging.debug("Found file: %s", file_name)
 
-    # Create a graph using pygraphviz to render it as SVG and PNG
-    A = to_agraph(G)
+            # Pick the handler from the extension; 'jinja' in the name wins, as it always has
+            if 'jinja' in file_name:
+                handler = _handle_jinja
+            else:
+                handler = _HANDLERS.get(file_name[file_name.rfind('.'):].lower())
+            if handler is not None:
+                nodes_added, edges_added = handler(G, edge_lines, file_path, file_name)
+                node_count += nodes_added
+                edge_count += edges_added
 
-    # Enhance nodes and edges with properties
-    for node in G.nodes(data=True):
-        node_label = f"{node[1]['label']}\n"
-        node_data = []
-        for n in G[node[0]]:
-            node_data.append(f"{n}: {G[node[0]][n]['key']} = {G[node[0]][n]['value']}")
-        node_label += "\n".join(node_data)
-        A.get_node(node[0]).attr["label"] = node_label
+    # Fold each node's outgoing edges into its label; edges were labelled when added, so to_agraph carries both over
+    for node, data in G.nodes(data=True):
+        data["label"] = f"{data['label']}\n" + "\n".join(edge_lines.get(node, {}).values())
 
-    for edge in G.edges(data=True):
-        edge_label = f"{edge[2]['key']} = {edge[2]['value']}"
-        A.get_edge(edge[0], edge[1]).attr["label"] = edge_label
+    # Create a graph using pygraphviz to render it as SVG and PNG
+    A = to_agraph(G)
 
     logging.info(f"Drawing the graph and saving it to {output_svg} and {output_png}")
 
@@ -195,15 +231,19 @@ def generate_relationship_graph(directory, output_svg, output_png):
     A.layout(prog='dot')  # Still using 'dot' layout for better rendering of hierarchical graphs
     A.draw(output_svg)
 
-    # Save PNG with higher DPI, increase bitmap memory size
-    A.draw(output_png, args="-Gdpi=600 -Gsize=48,48!")  # High DPI and larger canvas to improve PNG resolution
+    # Save PNG at 150 DPI; hires restores the 600 DPI, 48x48 inch canvas (a bitmap of several hundred megapixels)
+    if hires:
+        A.draw(output_png, args="-Gdpi=600 -Gsize=48,48!")
+    else:
+        A.draw(output_png, args="-Gdpi=150")
 
-    # Also display the graph using matplotlib with increased figure size and DPI
-    pos = nx.spring_layout(G)
-    plt.figure(figsize=(48, 48), dpi=600)  # Even larger figure size and higher DPI to avoid scaling warnings
-    nx.draw(G, pos, with_labels=True, node_size=3000, node_color='skyblue', font_size=10, font_color='black', font_weight='bold')
-    plt.savefig(output_png, dpi=600)  # Save PNG with higher DPI to improve resolution
-    plt.show()
+    # Optionally preview the graph with matplotlib; this no longer overwrites the PNG drawn above
+    if matplotlib_debug:
+        import matplotlib.pyplot as plt
+        pos = nx.spring_layout(G)
+        plt.figure(figsize=(12, 12))
+        nx.draw(G, pos, with_labels=True, node_size=3000, node_color='skyblue', font_size=10, font_color='black', font_weight='bold')
+        plt.show()
 
     logging.info(f"Graph generation completed")
     logging.info(f"Nodes added: {node_count}")
@@ -217,7 +257,13 @@ if __name__ == "__main__":
     parser.add_argument("playbook_path", type=str, help="Path to the directory containing YAML, Jinja, .ini, and properties files.")
     parser.add_argument("output_svg", type=str, help="Output path for the SVG file.")
     parser.add_argument("output_png", type=str, help="Output path for the PNG file.")
+    parser.add_argument("--hires", action="store_true", help="Render the PNG at 600 DPI on a 48x48 inch canvas instead of 150 DPI.")
+    parser.add_argument("--matplotlib-debug", action="store_true", help="Also show the graph in a matplotlib window.")
+    parser.add_argument("--verbose", action="store_true", help="Log every file found, parsed and added to the graph.")
     args = parser.parse_args()
 
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
     # Generate the relationship graph
-    generate_relationship_graph(args.playbook_path, args.output_svg, args.output_png)
+    generate_relationship_graph(args.playbook_path, args.output_svg, args.output_png, hires=args.hires, matplotlib_debug=args.matplotlib_debug)